@@ -0,0 +1,661 @@
+#!/bin/bash
+
+###############################################################
+# MP3 FULL AUDIT TOOL (Enhanced)
+#
+# - Scans ALL MP3 files (not just reducible ones)
+# - Reports bitrate, size, duration
+# - Extracts basic ID3 metadata (title, artist, album)
+# - Indicates whether ID3 tags are present
+# - Optionally cross-references Playnite game metadata CSV
+#   (Name, Sources, Id) to map folder IDs to game titles/sources
+# - Supports interactive/autonomous batching
+# - CSV export with batch totals or final totals
+# - Optional directory argument (defaults to current directory)
+# - Color-coded output
+#
+# Usage:
+#   ./mp3_full_audit.sh
+#   ./mp3_full_audit.sh "/path/to/music"
+#
+###############################################################
+
+########################
+# Color Definitions
+########################
+RED="\033[0;31m"
+GREEN="\033[0;32m"
+YELLOW="\033[1;33m"
+CYAN="\033[0;36m"
+MAGENTA="\033[0;35m"
+RESET="\033[0m"
+
+########################
+# Configuration
+########################
+BATCH_SIZE=50
+PARALLEL_JOBS=$(nproc 2>/dev/null || echo 8)  # concurrent ffprobe workers, one per usable CPU
+PROBE_CHUNK=16    # files handed to each ffprobe worker shell per startup
+PROBE_CACHE_FILE="${XDG_CACHE_HOME:-$HOME/.cache}/mp3_full_audit/probe_cache"  # "" = don't persist
+
+# Default Playnite CSV filename (can be adjusted if needed)
+PLAYNITE_CSV_DEFAULT="titles_sources_ids.csv"
+
+########################
+# Directory Handling
+########################
+# If a directory argument is provided, attempt to cd into it.
+if [ -n "$1" ]; then
+    if [ -d "$1" ]; then
+        cd "$1" || { echo -e "${RED}Failed to enter directory: $1${RESET}"; exit 1; }
+    else
+        echo -e "${RED}Directory does not exist: $1${RESET}"
+        exit 1
+    fi
+fi
+
+########################
+# Dependency Check
+########################
+for cmd in ffprobe; do
+    if ! command -v "$cmd" >/dev/null 2>&1; then
+        echo -e "${RED}Missing required command: $cmd${RESET}"
+        exit 1
+    fi
+done
+
+# Resolved once here; worker shells run this path without a PATH search
+FFPROBE=$(command -v ffprobe)
+export FFPROBE
+
+########################
+# Global State Variables
+########################
+INTERACTIVE=0
+CSV_BATCH_TOTALS=0
+TOTAL_FILES=0
+AUDIT_FILES=()
+AUDIT_SIZES=()
+AUDIT_MTIMES=()
+
+# Associative arrays for Playnite metadata (requires Bash 4+)
+declare -A GAME_TITLE_BY_ID
+declare -A GAME_SOURCE_BY_ID
+
+########################
+# Helper: Prompt for interactive vs autonomous mode
+########################
+prompt_interactive_mode() {
+    echo ""
+    echo -e "${CYAN}Display mode:${RESET}"
+    echo "1) Interactive (pause every ${BATCH_SIZE} files)"
+    echo "2) Autonomous (no pauses)"
+    read -p "Choose display mode [1-2]: " mode
+    case "$mode" in
+        1) INTERACTIVE=1 ;;
+        2) INTERACTIVE=0 ;;
+        *) echo -e "${YELLOW}Invalid choice, defaulting to autonomous.${RESET}"; INTERACTIVE=0 ;;
+    esac
+}
+
+########################
+# Helper: Pause if interactive and at batch boundary
+########################
+pause_if_interactive() {
+    local count="$1"
+    if [ "$INTERACTIVE" -eq 1 ] && [ $((count % BATCH_SIZE)) -eq 0 ]; then
+        read -p "Press Enter to continue..." _
+    fi
+}
+
+########################
+# Helper: Prompt for CSV totals mode
+########################
+prompt_csv_totals_mode() {
+    echo ""
+    echo -e "${CYAN}CSV totals mode:${RESET}"
+    echo "1) Include batch totals every ${BATCH_SIZE} files"
+    echo "2) Only final totals at the end"
+    read -p "Choose CSV totals mode [1-2]: " mode
+    case "$mode" in
+        1) CSV_BATCH_TOTALS=1 ;;
+        2) CSV_BATCH_TOTALS=0 ;;
+        *) echo -e "${YELLOW}Invalid choice, defaulting to final totals only.${RESET}"; CSV_BATCH_TOTALS=0 ;;
+    esac
+}
+
+########################
+# Helper: Pre-scan to collect and count all MP3 files
+#
+# The walk happens once; iterate_all_files reuses AUDIT_FILES. find also
+# reports each file's size and mtime, so no stat process is needed per file
+# later and the probe cache can be checked without touching the file.
+########################
+prescan_total_files() {
+    local size mtime file
+    AUDIT_FILES=()
+    AUDIT_SIZES=()
+    AUDIT_MTIMES=()
+    while IFS=$'\t' read -r -d '' size mtime file; do
+        AUDIT_SIZES+=("$size")
+        AUDIT_MTIMES+=("$mtime")
+        AUDIT_FILES+=("$file")
+    done < <(find . -iname "*.mp3" -type f -printf '%s\t%T@\t%p\0')
+    TOTAL_FILES=${#AUDIT_FILES[@]}
+    if [ "$TOTAL_FILES" -eq 0 ]; then
+        echo -e "${YELLOW}No MP3 files found in this directory.${RESET}"
+    else
+        echo -e "${CYAN}Found $TOTAL_FILES MP3 files to process.${RESET}"
+    fi
+}
+
+########################
+# Helper: Progress display
+########################
+show_progress() {
+    local count="$1"
+    if [ "$TOTAL_FILES" -gt 0 ]; then
+        local percent=$((count * 100 / TOTAL_FILES))
+        # Simple progress bar (width 20)
+        local filled=$((percent / 5))
+        local bar=""
+        for ((i=0; i<filled; i++)); do bar+="#"; done
+        for ((i=filled; i<20; i++)); do bar+="."; done
+        echo -ne "${CYAN}[${bar}] ${percent}% (${count}/${TOTAL_FILES})\r${RESET}"
+    fi
+}
+
+########################
+# AWK-Based Forgiving CSV Loader (Git Bash Safe)
+########################
+load_playnite_csv() {
+    local csv_file=""
+
+    # Auto-detect default CSV or ask user
+    if [ -f "$PLAYNITE_CSV_DEFAULT" ]; then
+        csv_file="$PLAYNITE_CSV_DEFAULT"
+        echo -e "${GREEN}Found Playnite CSV:${RESET} $csv_file"
+    else
+        echo ""
+        echo -e "${CYAN}Playnite CSV not found as '${PLAYNITE_CSV_DEFAULT}'.${RESET}"
+        read -p "Enter Playnite CSV filename to use (or leave blank to skip): " user_csv
+        if [ -n "$user_csv" ] && [ -f "$user_csv" ]; then
+            csv_file="$user_csv"
+            echo -e "${GREEN}Using Playnite CSV:${RESET} $csv_file"
+        elif [ -n "$user_csv" ]; then
+            echo -e "${YELLOW}File not found: $user_csv. Skipping Playnite metadata.${RESET}"
+            return
+        else
+            echo -e "${YELLOW}No Playnite CSV specified. Skipping Playnite metadata.${RESET}"
+            return
+        fi
+    fi
+
+    # AWK loader: handles huge CSVs, UTF-8, quotes, commas, CRLF, BOM
+    awk -F',' '
+        BEGIN {
+            # nothing
+        }
+
+        NR == 1 {
+            # Skip header row
+            next
+        }
+
+        {
+            # Strip BOM on first field if present
+            gsub(/^\xef\xbb\xbf/, "", $1)
+
+            # Trim whitespace on all fields
+            for (i = 1; i <= NF; i++) {
+                sub(/^[ \t\r\n]+/, "", $i)
+                sub(/[ \t\r\n]+$/, "", $i)
+            }
+
+            name   = $1
+            source = $2
+            id     = $3
+
+            # Skip malformed lines
+            if (id == "" || id == "\"\"" || id == "\"") next
+
+            # Remove surrounding quotes
+            gsub(/^"/, "", name);   gsub(/"$/, "", name)
+            gsub(/^"/, "", source); gsub(/"$/, "", source)
+            gsub(/^"/, "", id);     gsub(/"$/, "", id)
+
+            # Print in a Bash-friendly format
+            printf("GAME_TITLE_BY_ID[%s]=\"%s\"\n", id, name)
+            printf("GAME_SOURCE_BY_ID[%s]=\"%s\"\n", id, source)
+        }
+    ' "$csv_file" > /tmp/playnite_map.sh
+
+    # Source the generated associative array assignments
+    source /tmp/playnite_map.sh
+    rm -f /tmp/playnite_map.sh
+
+    echo -e "${GREEN}Loaded Playnite metadata for ${#GAME_TITLE_BY_ID[@]} IDs.${RESET}"
+}
+
+########################
+# Helper: Extract folder ID and map to Playnite metadata
+########################
+get_playnite_metadata_for_file() {
+    # Sets PLAYNITE_ID, PLAYNITE_TITLE and PLAYNITE_SOURCE in the calling
+    # shell; parameter expansion only, so no process is started per file
+    local file="$1"
+    local dir="${file%/*}"
+
+    # Assume the immediate folder name is the ID
+    PLAYNITE_ID="${dir##*/}"
+    PLAYNITE_TITLE="${GAME_TITLE_BY_ID[$PLAYNITE_ID]}"
+    PLAYNITE_SOURCE=""
+    if [ -n "$PLAYNITE_TITLE" ]; then
+        PLAYNITE_SOURCE="${GAME_SOURCE_BY_ID[$PLAYNITE_ID]}"
+    fi
+}
+
+########################
+# Helper: Probe audio info and ID3 metadata with a single ffprobe call
+#
+# Sets PROBE_BITRATE, PROBE_DURATION, PROBE_TITLE, PROBE_ARTIST,
+# PROBE_ALBUM and PROBE_HAS_TAGS ("yes"/"no").
+########################
+probe_file() {
+    local file="$1"
+
+    PROBE_BITRATE=""
+    PROBE_DURATION=""
+    PROBE_TITLE=""
+    PROBE_ARTIST=""
+    PROBE_ALBUM=""
+
+    # -probesize keeps ffprobe to the first 32 KB after the ID3 tag; the
+    # MPEG frame and Xing header there carry everything asked for.
+    # key=value lines, e.g. "bit_rate=320000" or "TAG:title=Main Theme"
+    local key value
+    while IFS='=' read -r key value; do
+        case "$key" in
+            bit_rate)   PROBE_BITRATE="$value" ;;
+            duration)   PROBE_DURATION="$value" ;;
+            TAG:title)  [ -z "$PROBE_TITLE" ]  && PROBE_TITLE="$value" ;;
+            TAG:artist) [ -z "$PROBE_ARTIST" ] && PROBE_ARTIST="$value" ;;
+            TAG:album)  [ -z "$PROBE_ALBUM" ]  && PROBE_ALBUM="$value" ;;
+        esac
+    done < <("$FFPROBE" -v error -probesize 32768 -select_streams a:0 \
+             -show_entries stream=bit_rate:format=duration:format_tags=title,artist,album \
+             -of default=noprint_wrappers=1 "$file" 2>/dev/null)
+
+    # Determine if any ID3 tags are present
+    PROBE_HAS_TAGS="no"
+    if [ -n "$PROBE_TITLE" ] || [ -n "$PROBE_ARTIST" ] || [ -n "$PROBE_ALBUM" ]; then
+        PROBE_HAS_TAGS="yes"
+    fi
+}
+
+########################
+# Probe cache
+#
+# Probe results are kept across runs, keyed by absolute path, with fields
+# separated by US (0x1f) like the probe records:
+#   PROBE_CACHE[/abs/file]="size US mtime US bitrate US duration US title US artist US album US has_tags"
+# An entry is only reused while the file's size and mtime are unchanged.
+########################
+declare -A PROBE_CACHE
+declare -A PROBE_CACHE_UPDATED  # keys whose entry this run added or changed
+
+remember_probe() {
+    # Called by iterate_all_files for every record it reads; failed probes
+    # are not stored, so the file is tried again next time
+    local index="$1"
+    [ -n "$2" ] && [ -n "$3" ] || return 0
+    local file="${AUDIT_FILES[$index]}"
+    local key="$PWD/${file#./}"
+    local value="${AUDIT_SIZES[$index]}"$'\x1f'"${AUDIT_MTIMES[$index]}"
+    shift
+    local field
+    for field in "$@"; do
+        value+=$'\x1f'"$field"
+    done
+    if [ "${PROBE_CACHE["$key"]}" != "$value" ]; then
+        PROBE_CACHE["$key"]="$value"
+        PROBE_CACHE_UPDATED["$key"]=1
+    fi
+}
+
+read_probe_cache_file() {
+    # Fills the associative array named by $1 from PROBE_CACHE_FILE.
+    # Records are NUL-terminated, the cached fields followed by the path
+    local -n cache="$1"
+    [ -n "$PROBE_CACHE_FILE" ] && [ -r "$PROBE_CACHE_FILE" ] || return 0
+    local record
+    while IFS= read -r -d '' record; do
+        cache["${record##*$'\x1f'}"]="${record%$'\x1f'*}"
+    done < "$PROBE_CACHE_FILE"
+}
+
+load_probe_cache() {
+    read_probe_cache_file PROBE_CACHE
+}
+
+save_probe_cache() {
+    # Re-reads the file so entries saved by another run since startup are
+    # kept, then lays this run's updates on top. Entries are only pruned
+    # when they sit under the scanned folder and the file is gone; paths
+    # elsewhere may just be unmounted right now. Each run writes its own
+    # mktemp file and renames it, so runs can't interleave or truncate it.
+    [ -n "$PROBE_CACHE_FILE" ] && [ "${#PROBE_CACHE_UPDATED[@]}" -gt 0 ] || return 0
+    mkdir -p "$(dirname "$PROBE_CACHE_FILE")" || return 0
+    local -A merged=()
+    local file tmp
+    read_probe_cache_file merged
+    for file in "${!PROBE_CACHE_UPDATED[@]}"; do
+        merged["$file"]="${PROBE_CACHE[$file]}"
+    done
+    tmp=$(mktemp "$PROBE_CACHE_FILE.XXXXXX") || return 0
+    for file in "${!merged[@]}"; do
+        if [[ "$file" == "$PWD/"* ]] && [ ! -f "$file" ]; then
+            continue
+        fi
+        printf '%s\x1f%s\0' "${merged[$file]}" "$file"
+    done > "$tmp" && mv -f "$tmp" "$PROBE_CACHE_FILE" || rm -f "$tmp"
+    PROBE_CACHE_UPDATED=()
+}
+
+########################
+# Parallel probe
+#
+# probe_worker runs inside each xargs worker; arguments are "index|file"
+# entries from AUDIT_FILES. It prints one NUL-terminated record per file,
+# fields separated by US (0x1f) since ID3 text may contain "|":
+#   index, bitrate, duration, title, artist, album, has_tags
+########################
+probe_worker() {
+    local entry
+    for entry in "$@"; do
+        probe_file "${entry#*|}"
+        printf '%s\x1f%s\x1f%s\x1f%s\x1f%s\x1f%s\x1f%s\0' "${entry%%|*}" \
+            "$PROBE_BITRATE" "$PROBE_DURATION" \
+            "$PROBE_TITLE" "$PROBE_ARTIST" "$PROBE_ALBUM" "$PROBE_HAS_TAGS"
+    done
+}
+
+probe_all_files() {
+    # Probes AUDIT_FILES across PARALLEL_JOBS workers; each record is passed
+    # on as soon as every lower index has arrived, so output keeps the
+    # prescan order while the progress bar still moves during probing.
+    # Cache hits are written straight to the output (fd 3) without ffprobe.
+    local i file cached stamp
+    export -f probe_file probe_worker
+    {
+        for i in "${!AUDIT_FILES[@]}"; do
+            file="${AUDIT_FILES[$i]}"
+            cached="${PROBE_CACHE[$PWD/${file#./}]}"
+            stamp="${AUDIT_SIZES[$i]}"$'\x1f'"${AUDIT_MTIMES[$i]}"$'\x1f'
+            if [[ -n "$cached" && "$cached" == "$stamp"* ]]; then
+                printf '%d\x1f%s\0' "$i" "${cached#"$stamp"}" >&3
+            else
+                printf '%d|%s\0' "$i" "$file"
+            fi
+        done \
+            | xargs -0 -r -P "$PARALLEL_JOBS" -n "$PROBE_CHUNK" \
+                  bash -c 'probe_worker "$@"' _
+    } 3>&1 | {
+        local next=0 record
+        local -A pending=()
+        while IFS= read -r -d '' record; do
+            pending[${record%%$'\x1f'*}]="$record"
+            while [ -n "${pending[$next]+set}" ]; do
+                printf '%s\0' "${pending[$next]}"
+                unset 'pending[$next]'
+                next=$((next + 1))
+            done
+        done
+    }
+}
+
+########################
+# Core iterator: ALL MP3 files
+#
+# Calls a callback function with:
+#   callback "$file" "$bitrate" "$filesize" "$duration" \
+#             "$title" "$artist" "$album" "$has_tags" \
+#             "$game_id" "$game_title" "$game_source"
+########################
+iterate_all_files() {
+    local callback="$1"
+
+    # Runs in the current shell so COUNT and the size totals survive the loop.
+    # Records arrive on fd 3 so interactive pauses still read the terminal.
+    local index bitrate duration title artist album has_tags file
+    while IFS=$'\x1f' read -r -d '' -u 3 index bitrate duration title artist album has_tags; do
+        file="${AUDIT_FILES[$index]}"
+        remember_probe "$index" "$bitrate" "$duration" "$title" "$artist" "$album" "$has_tags"
+
+        if [ -z "$bitrate" ]; then
+            echo -e "${YELLOW}Skipping (no bitrate info):${RESET} $file"
+            continue
+        fi
+
+        # Filesize (collected by the pre-scan)
+        local filesize="${AUDIT_SIZES[$index]}"
+
+        if [ -z "$duration" ]; then
+            echo -e "${YELLOW}Skipping (no duration info):${RESET} $file"
+            continue
+        fi
+
+        # Playnite metadata
+        local game_id game_title game_source
+        get_playnite_metadata_for_file "$file"
+        game_id="$PLAYNITE_ID"
+        game_title="$PLAYNITE_TITLE"
+        game_source="$PLAYNITE_SOURCE"
+
+        "$callback" "$file" "$bitrate" "$filesize" "$duration" \
+                    "$title" "$artist" "$album" "$has_tags" \
+                    "$game_id" "$game_title" "$game_source"
+    done 3< <(probe_all_files)
+}
+
+########################
+# AUDIT MODE
+########################
+
+# Callback for on-screen audit
+audit_callback() {
+    local file="$1"
+    local bitrate="$2"
+    local filesize="$3"
+    local duration="$4"
+    local title="$5"
+    local artist="$6"
+    local album="$7"
+    local has_tags="$8"
+    local game_id="$9"
+    local game_title="${10}"
+    local game_source="${11}"
+
+    COUNT=$((COUNT + 1))
+    BATCH_SIZE_SUM=$((BATCH_SIZE_SUM + filesize))
+    TOTAL_SIZE_SUM=$((TOTAL_SIZE_SUM + filesize))
+
+    # Progress bar in-place
+    show_progress "$COUNT"
+
+    echo ""
+    echo -e "${MAGENTA}FILE:${RESET} $file"
+    echo "  Bitrate:  $bitrate bps"
+    echo "  Size:     $filesize bytes"
+    echo "  Duration: ${duration}s"
+
+    if [ "$has_tags" = "yes" ]; then
+        echo -e "  ID3 Tags: ${GREEN}present${RESET}"
+    else
+        echo -e "  ID3 Tags: ${YELLOW}missing${RESET}"
+    fi
+
+    if [ -n "$title" ]; then
+        echo "  Title:    $title"
+    fi
+    if [ -n "$artist" ]; then
+        echo "  Artist:   $artist"
+    fi
+    if [ -n "$album" ]; then
+        echo "  Album:    $album"
+    fi
+
+    if [ -n "$game_id" ] || [ -n "$game_title" ] || [ -n "$game_source" ]; then
+        echo "  Game ID:      $game_id"
+        echo "  Game Title:   $game_title"
+        echo "  Game Source:  $game_source"
+    fi
+
+    echo ""
+
+    if [ $((COUNT % BATCH_SIZE)) -eq 0 ]; then
+        echo -e "${CYAN}--- Batch of ${BATCH_SIZE} files ---${RESET}"
+        echo "  Batch size: $BATCH_SIZE_SUM bytes"
+        echo ""
+        echo -e "${CYAN}Cumulative totals so far:${RESET}"
+        echo "  Total size: $TOTAL_SIZE_SUM bytes"
+        echo ""
+        BATCH_SIZE_SUM=0
+        pause_if_interactive "$COUNT"
+    fi
+}
+
+audit_mode() {
+    echo ""
+    echo -e "${MAGENTA}Full Audit Mode (all MP3 files)${RESET}"
+    prompt_interactive_mode
+    load_playnite_csv
+    prescan_total_files
+
+    COUNT=0
+    BATCH_SIZE_SUM=0
+    TOTAL_SIZE_SUM=0
+
+    iterate_all_files audit_callback
+
+    # Clear progress line
+    echo -ne "\r\033[K"
+
+    # Final partial batch
+    if [ $((COUNT % BATCH_SIZE)) -ne 0 ]; then
+        echo -e "${CYAN}--- Final partial batch ($((COUNT % BATCH_SIZE)) files) ---${RESET}"
+        echo "  Batch size: $BATCH_SIZE_SUM bytes"
+        echo ""
+    fi
+
+    echo -e "${GREEN}=== Audit Totals ===${RESET}"
+    echo "Total files: $COUNT"
+    echo "Total size:  $TOTAL_SIZE_SUM bytes"
+    echo ""
+}
+
+########################
+# CSV EXPORT MODE
+########################
+
+# Callback for CSV export
+csv_callback() {
+    local file="$1"
+    local bitrate="$2"
+    local filesize="$3"
+    local duration="$4"
+    local title="$5"
+    local artist="$6"
+    local album="$7"
+    local has_tags="$8"
+    local game_id="$9"
+    local game_title="${10}"
+    local game_source="${11}"
+
+    COUNT=$((COUNT + 1))
+    BATCH_SIZE_SUM=$((BATCH_SIZE_SUM + filesize))
+    TOTAL_SIZE_SUM=$((TOTAL_SIZE_SUM + filesize))
+
+    # Progress bar in-place
+    show_progress "$COUNT"
+
+    # Escape double quotes in text fields for CSV safety
+    # (parameter expansion, so no sed process per field)
+    local esc_file="${file//\"/\"\"}"
+    local esc_title="${title//\"/\"\"}"
+    local esc_artist="${artist//\"/\"\"}"
+    local esc_album="${album//\"/\"\"}"
+    local esc_game_title="${game_title//\"/\"\"}"
+    local esc_game_source="${game_source//\"/\"\"}"
+
+    # CSV columns:
+    # file,bitrate,size,duration,title,artist,album,has_id3_tags,game_id,game_title,game_source
+    echo "\"$esc_game_title\",\"$esc_game_source\",\"$game_id\",$duration,$bitrate,$filesize,$has_tags,\"$esc_title\",\"$esc_artist\",\"$esc_album\",\"$esc_file\"" >&4
+
+    if [ $((COUNT % BATCH_SIZE)) -eq 0 ] && [ "$CSV_BATCH_TOTALS" -eq 1 ]; then
+        echo "\"BATCH_TOTAL_${COUNT}\",,$BATCH_SIZE_SUM,,,,,,,," >&4
+        BATCH_SIZE_SUM=0
+    fi
+
+    if [ "$INTERACTIVE" -eq 1 ] && [ $((COUNT % BATCH_SIZE)) -eq 0 ]; then
+        echo -e "${CYAN}Processed $COUNT files so far...${RESET}"
+        pause_if_interactive "$COUNT"
+    fi
+}
+
+csv_mode() {
+    echo ""
+    echo -e "${MAGENTA}CSV Export (all MP3 files)${RESET}"
+    prompt_interactive_mode
+    prompt_csv_totals_mode
+    load_playnite_csv
+    prescan_total_files
+
+    CSV_FILE="full_audit_$(date +%Y%m%d_%H%M%S).csv"
+    echo "game_title,game_source,game_id,duration,bitrate,size,has_id3_tags,title,artist,album,file" > "$CSV_FILE"
+
+    COUNT=0
+    BATCH_SIZE_SUM=0
+    TOTAL_SIZE_SUM=0
+
+    # The report is opened once for the whole scan; csv_callback writes to
+    # fd 4 (fd 3 carries the probe records inside iterate_all_files)
+    iterate_all_files csv_callback 4>>"$CSV_FILE"
+
+    # Clear progress line
+    echo -ne "\r\033[K"
+
+    # Final partial batch totals
+    if [ "$CSV_BATCH_TOTALS" -eq 1 ] && [ $((COUNT % BATCH_SIZE)) -ne 0 ]; then
+        echo "\"BATCH_TOTAL_${COUNT}\",,$BATCH_SIZE_SUM,,,,,,,," >> "$CSV_FILE"
+    fi
+
+    # Final totals row
+    echo "\"GRAND_TOTAL\",,$TOTAL_SIZE_SUM,,,,,,,," >> "$CSV_FILE"
+
+    echo -e "${GREEN}CSV export complete:${RESET} $CSV_FILE"
+}
+
+########################
+# MAIN MENU
+########################
+load_probe_cache
+trap save_probe_cache EXIT
+
+while true; do
+    echo ""
+    echo -e "${MAGENTA}MP3 Full Audit Tool (Enhanced)${RESET}"
+    echo "-------------------------------"
+    echo "1) Full audit (all MP3s)"
+    echo "2) Export full CSV"
+    echo "3) Exit"
+    echo ""
+    read -p "Choose an option [1-3]: " choice
+
+    case "$choice" in
+        1) audit_mode ;;
+        2) csv_mode ;;
+        3) echo "Goodbye."; exit 0 ;;
+        *) echo -e "${YELLOW}Invalid choice.${RESET}" ;;
+    esac
+done
@@ -0,0 +1,896 @@
+#!/bin/bash
+
+#############################################
+# MP3 Reduction Tool (Preview / Reduce / CSV / Safe Delete)
+# v1.2.0 — Fast-scan, time-filtered, threshold-aware, subshell-safe, null-safe, WSL-friendly
+#############################################
+
+# -------- Colors --------
+RED="\033[0;31m"
+GREEN="\033[0;32m"
+YELLOW="\033[1;33m"
+CYAN="\033[0;36m"
+MAGENTA="\033[0;35m"
+RESET="\033[0m"
+
+# -------- Config --------
+TARGET_BITRATE=128000   # 128 kbps in bps
+BATCH_SIZE=50
+PARALLEL_JOBS=$(nproc 2>/dev/null || echo 8)  # one worker per usable CPU
+WORKER_CHUNK=4          # files handed to each worker shell per startup
+PROBE_JOBS=$PARALLEL_JOBS  # concurrent ffprobe workers (raise for slow network shares)
+PROBE_CHUNK=16          # files handed to each ffprobe worker shell per startup
+PIN_WORKERS=1           # 1 = pin each reduction worker to its own CPU (needs taskset)
+DROP_PAGE_CACHE=1       # 1 = evict originals/outputs from the page cache after encoding
+VERIFY_REDUCED=1        # 1 = ffprobe each reduced file before safe-delete trusts it
+MIN_SAVINGS_PERCENT=20  # default minimum savings (percent)
+TIME_FILTER_MINUTES=0   # 0 = all files, >0 = only files modified in last N minutes
+QUIET=0                 # 1 = preview prints batch and final totals only, no per-file details
+MIN_DURATION_SECONDS=0  # >0 = skip, without probing, files too small to last this long
+PROBE_CACHE_FILE="${XDG_CACHE_HOME:-$HOME/.cache}/mp3_reduce/probe_cache"  # "" = don't persist
+
+# -------- Directory Handling --------
+if [ -n "$1" ]; then
+    if [ -d "$1" ]; then
+        cd "$1" || { echo -e "${RED}Failed to enter directory: $1${RESET}"; exit 1; }
+    else
+        echo -e "${RED}Directory does not exist: $1${RESET}"
+        exit 1
+    fi
+fi
+
+# -------- Dependency Check --------
+for cmd in ffprobe ffmpeg; do
+    if ! command -v "$cmd" >/dev/null 2>&1; then
+        echo -e "${RED}Missing required command: $cmd${RESET}"
+        exit 1
+    fi
+done
+
+# Resolved once here; worker shells run these paths without a PATH search
+FFPROBE=$(command -v ffprobe)
+FFMPEG=$(command -v ffmpeg)
+export FFPROBE FFMPEG
+
+# -------- Helpers --------
+prompt_interactive_mode() {
+    echo ""
+    echo -e "${CYAN}Display mode:${RESET}"
+    echo "1) Interactive (pause every ${BATCH_SIZE} files)"
+    echo "2) Autonomous (no pauses)"
+    read -p "Choose display mode [1-2]: " mode
+    case "$mode" in
+        1) INTERACTIVE=1 ;;
+        2) INTERACTIVE=0 ;;
+        *) echo -e "${YELLOW}Invalid choice, defaulting to autonomous.${RESET}"; INTERACTIVE=0 ;;
+    esac
+}
+
+prompt_csv_totals_mode() {
+    echo ""
+    echo -e "${CYAN}CSV totals mode:${RESET}"
+    echo "1) Include batch totals every ${BATCH_SIZE} files"
+    echo "2) Only final totals at the end"
+    read -p "Choose CSV totals mode [1-2]: " mode
+    case "$mode" in
+        1) CSV_BATCH_TOTALS=1 ;;
+        2) CSV_BATCH_TOTALS=0 ;;
+        *) echo -e "${YELLOW}Invalid choice, defaulting to final totals only.${RESET}"; CSV_BATCH_TOTALS=0 ;;
+    esac
+}
+
+prompt_savings_threshold() {
+    echo ""
+    echo -e "${CYAN}Minimum savings threshold:${RESET}"
+    echo "Current: ${MIN_SAVINGS_PERCENT}%"
+    read -p "Enter new minimum savings percent (1–99) or press Enter to keep: " val
+    if [ -z "$val" ]; then
+        return
+    fi
+    if [[ "$val" =~ ^[0-9]+$ ]] && [ "$val" -ge 1 ] && [ "$val" -le 99 ]; then
+        MIN_SAVINGS_PERCENT="$val"
+        echo -e "${GREEN}Using minimum savings threshold: ${MIN_SAVINGS_PERCENT}%${RESET}"
+    else
+        echo -e "${YELLOW}Invalid value. Keeping ${MIN_SAVINGS_PERCENT}%.${RESET}"
+    fi
+}
+
+prompt_time_filter() {
+    echo ""
+    echo -e "${CYAN}Time filter (modified within last N minutes):${RESET}"
+    echo "Current: ${TIME_FILTER_MINUTES} (0 = all files)"
+    read -p "Enter minutes (0 = all files) or press Enter to keep: " val
+    if [ -z "$val" ]; then
+        return
+    fi
+    if [[ "$val" =~ ^[0-9]+$ ]] && [ "$val" -ge 0 ]; then
+        TIME_FILTER_MINUTES="$val"
+        if [ "$TIME_FILTER_MINUTES" -eq 0 ]; then
+            echo -e "${GREEN}Time filter disabled (all files).${RESET}"
+        else
+            echo -e "${GREEN}Only files modified in the last ${TIME_FILTER_MINUTES} minutes will be considered.${RESET}"
+        fi
+    else
+        echo -e "${YELLOW}Invalid value. Keeping ${TIME_FILTER_MINUTES}.${RESET}"
+    fi
+}
+
+build_find_args() {
+    # Sets FIND_ARGS, honoring TIME_FILTER_MINUTES. An array needs no eval
+    # and no command-substitution subshell at each call site.
+    # Name tests come first so non-MP3 entries are rejected before any stat
+    FIND_ARGS=(. -iname "*.mp3" ! -iname "*_reduced.mp3" -type f)
+    if [ "$TIME_FILTER_MINUTES" -gt 0 ]; then
+        FIND_ARGS+=(-mmin "-$TIME_FILTER_MINUTES")
+    fi
+}
+
+# -------- Single-pass Probe --------
+probe_file() {
+    # One ffprobe call per file for both bitrate and duration.
+    # -probesize keeps ffprobe to the first 32 KB after the ID3 tag; the
+    # MPEG frame and Xing header there carry everything asked for.
+    # Sets PROBE_BITRATE and PROBE_DURATION (empty when unavailable).
+    PROBE_BITRATE=""
+    PROBE_DURATION=""
+
+    local key value
+    while IFS='=' read -r key value; do
+        case "$key" in
+            bit_rate) PROBE_BITRATE="$value" ;;
+            duration) PROBE_DURATION="$value" ;;
+        esac
+    done < <("$FFPROBE" -v error -probesize 32768 -select_streams a:0 \
+             -show_entries stream=bit_rate:format=duration \
+             -of default=noprint_wrappers=1 "$1" 2>/dev/null)
+
+    # ffprobe reports "N/A" when a value is unknown
+    [[ "$PROBE_BITRATE" =~ ^[0-9]+$ ]] || PROBE_BITRATE=""
+    [[ "$PROBE_DURATION" =~ ^[0-9.]+$ ]] || PROBE_DURATION=""
+}
+
+estimate_reduced_size() {
+    # TARGET_BITRATE * duration / 8 in shell integer math (no bc fork per file).
+    # Duration is scaled to microseconds to keep ffprobe's six decimals.
+    # Sets ESTIMATED_SIZE (bytes, truncated like bc's default scale).
+    local whole="${1%%.*}"
+    local frac=""
+    if [[ "$1" == *.* ]]; then
+        frac="${1#*.}"
+    fi
+    frac="${frac}000000"
+    frac="${frac:0:6}"
+
+    local micros=$(( 10#${whole:-0} * 1000000 + 10#$frac ))
+    ESTIMATED_SIZE=$(( micros * TARGET_BITRATE / 8 / 1000000 ))
+}
+
+# -------- Parallel Probe --------
+# Probe results are remembered for the rest of the session, keyed by
+# absolute path so one cache file serves every music folder:
+#   PROBE_CACHE[/abs/file]="size|mtime|bitrate|duration"
+# An entry is only reused while the file's size and mtime are unchanged, so
+# switching between preview, CSV and reduction doesn't re-run ffprobe.
+# The cache is also saved to PROBE_CACHE_FILE on exit and loaded at startup,
+# so unchanged files are not probed again on the next run either.
+declare -A PROBE_CACHE
+declare -A PROBE_CACHE_UPDATED  # keys whose entry this run added or changed
+
+remember_probe() {
+    # Called by record consumers (main shell) for every record they read.
+    # Failed probes are not stored, so the file is tried again next time.
+    [ -n "$1" ] && [ -n "$2" ] || return 0
+    local key="$PWD/${5#./}"
+    if [ "${PROBE_CACHE["$key"]}" != "$3|$4|$1|$2" ]; then
+        PROBE_CACHE["$key"]="$3|$4|$1|$2"
+        PROBE_CACHE_UPDATED["$key"]=1
+    fi
+}
+
+read_probe_cache_file() {
+    # Fills the associative array named by $1 from PROBE_CACHE_FILE.
+    # Records are NUL-terminated "size|mtime|bitrate|duration|file"; the
+    # path goes last so a "|" inside it ends up in the final field intact
+    local -n cache="$1"
+    [ -n "$PROBE_CACHE_FILE" ] && [ -r "$PROBE_CACHE_FILE" ] || return 0
+    local size mtime bitrate duration file
+    while IFS='|' read -r -d '' size mtime bitrate duration file; do
+        cache["$file"]="$size|$mtime|$bitrate|$duration"
+    done < "$PROBE_CACHE_FILE"
+}
+
+load_probe_cache() {
+    read_probe_cache_file PROBE_CACHE
+}
+
+save_probe_cache() {
+    # Re-reads the file so entries saved by another run since startup are
+    # kept, then lays this run's updates on top. Entries are only pruned
+    # when they sit under the scanned folder and the file is gone; paths
+    # elsewhere may just be unmounted right now. Each run writes its own
+    # mktemp file and renames it, so runs can't interleave or truncate it.
+    [ -n "$PROBE_CACHE_FILE" ] && [ "${#PROBE_CACHE_UPDATED[@]}" -gt 0 ] || return 0
+    mkdir -p "$(dirname "$PROBE_CACHE_FILE")" || return 0
+    local -A merged=()
+    local file tmp
+    read_probe_cache_file merged
+    for file in "${!PROBE_CACHE_UPDATED[@]}"; do
+        merged["$file"]="${PROBE_CACHE[$file]}"
+    done
+    tmp=$(mktemp "$PROBE_CACHE_FILE.XXXXXX") || return 0
+    for file in "${!merged[@]}"; do
+        if [[ "$file" == "$PWD/"* ]] && [ ! -f "$file" ]; then
+            continue
+        fi
+        printf '%s|%s\0' "${merged[$file]}" "$file"
+    done > "$tmp" && mv -f "$tmp" "$PROBE_CACHE_FILE" || rm -f "$tmp"
+    PROBE_CACHE_UPDATED=()
+}
+
+probe_worker() {
+    # Runs inside each xargs worker; arguments are "seq|size|mtime|file" entries.
+    # Prints one NUL-terminated "seq|bitrate|duration|size|mtime|file" record per file.
+    local entry seq size mtime file
+    for entry in "$@"; do
+        seq="${entry%%|*}"
+        entry="${entry#*|}"
+        size="${entry%%|*}"
+        entry="${entry#*|}"
+        mtime="${entry%%|*}"
+        file="${entry#*|}"
+
+        probe_file "$file"
+        printf '%s|%s|%s|%s|%s|%s\0' "$seq" "$PROBE_BITRATE" "$PROBE_DURATION" \
+            "$size" "$mtime" "$file"
+    done
+}
+
+probe_candidates() {
+    # Probes every file matched by FIND_ARGS across PROBE_JOBS workers.
+    # Cache hits are written straight to the output (fd 3) without ffprobe.
+    # Records are re-emitted in find order as soon as each one's turn comes,
+    # so output stays deterministic without waiting for the whole scan.
+    local seq=0 size mtime file cached
+
+    # A file above TARGET_BITRATE that plays for MIN_DURATION_SECONDS is at
+    # least this many bytes, so anything smaller is rejected by find itself
+    local size_args=()
+    if [ "$MIN_DURATION_SECONDS" -gt 0 ]; then
+        size_args=(-size "+$((TARGET_BITRATE * MIN_DURATION_SECONDS / 8 - 1))c")
+    fi
+
+    export -f probe_file probe_worker
+    {
+        while IFS=$'\t' read -r -d '' size mtime file; do
+            seq=$((seq + 1))
+            cached="${PROBE_CACHE[$PWD/${file#./}]}"
+            if [[ -n "$cached" && "$cached" == "$size|$mtime|"* ]]; then
+                printf '%d|%s|%s|%s|%s\0' "$seq" "${cached#"$size|$mtime|"}" \
+                    "$size" "$mtime" "$file" >&3
+            else
+                printf '%d|%s|%s|%s\0' "$seq" "$size" "$mtime" "$file"
+            fi
+        done < <(find "${FIND_ARGS[@]}" "${size_args[@]}" -printf '%s\t%T@\t%p\0') \
+            | xargs -0 -r -P "$PROBE_JOBS" -n "$PROBE_CHUNK" \
+                  bash -c 'probe_worker "$@"' _
+    } 3>&1 | {
+        local next=1 record
+        local -A pending=()
+        while IFS= read -r -d '' record; do
+            pending[${record%%|*}]="$record"
+            while [ -n "${pending[$next]+set}" ]; do
+                printf '%s\0' "${pending[$next]}"
+                unset 'pending[$next]'
+                next=$((next + 1))
+            done
+        done
+    }
+}
+
+# -------- Reducible File Iterator (no subshell) --------
+iterate_reducible_files() {
+    local callback="$1"
+    build_find_args
+
+    # Records arrive on fd 3 so interactive pauses still read the terminal
+    local bitrate duration filesize mtime file
+    while IFS='|' read -r -d '' -u 3 _ bitrate duration filesize mtime file; do
+        remember_probe "$bitrate" "$duration" "$filesize" "$mtime" "$file"
+
+        if [ -z "$bitrate" ]; then
+            echo -e "${YELLOW}Skipping (no bitrate info):${RESET} $file"
+            continue
+        fi
+
+        if [ "$bitrate" -le "$TARGET_BITRATE" ]; then
+            continue
+        fi
+
+        if [ -z "$duration" ]; then
+            echo -e "${YELLOW}Skipping (no duration info):${RESET} $file"
+            continue
+        fi
+
+        estimate_reduced_size "$duration"
+        local estimated_size="$ESTIMATED_SIZE"
+
+        "$callback" "$file" "$bitrate" "$filesize" "$duration" "$estimated_size"
+    done 3< <(probe_candidates)
+}
+
+# -------- Preview Mode --------
+preview_callback() {
+    local file="$1"
+    local bitrate="$2"
+    local filesize="$3"
+    local duration="$4"
+    local estimated_size="$5"
+
+    local savings_bytes=$((filesize - estimated_size))
+    local savings_percent=0
+    if [ "$savings_bytes" -gt 0 ]; then
+        savings_percent=$((savings_bytes * 100 / filesize))
+    fi
+
+    if [ "$QUIET" -eq 1 ]; then
+        # Totals only: nothing is written for individual files
+        if [ "$savings_bytes" -le 0 ] || [ "$savings_percent" -lt "$MIN_SAVINGS_PERCENT" ]; then
+            return
+        fi
+    else
+        # Each file's block is built up and written with a single printf
+        # rather than one echo (one write to the terminal) per line
+        local block
+        printf -v block "${MAGENTA}FILE:${RESET} %s\n  Current bitrate: %s bps\n  Current size:    %s bytes\n  Duration:        %ss\n  Estimated new:   %s bytes\n" \
+            "$file" "$bitrate" "$filesize" "$duration" "$estimated_size"
+
+        if [ "$savings_bytes" -le 0 ]; then
+            printf "%s  ${YELLOW}NOTE:${RESET} Estimated to grow or not shrink; will be ${RED}skipped${RESET}.\n\n" "$block"
+            return
+        fi
+
+        if [ "$savings_percent" -lt "$MIN_SAVINGS_PERCENT" ]; then
+            printf "%s  Estimated savings: %s bytes (%s%%)\n  ${YELLOW}NOTE:${RESET} Below threshold (%s%%), will be ${RED}skipped${RESET}.\n\n" \
+                "$block" "$savings_bytes" "$savings_percent" "$MIN_SAVINGS_PERCENT"
+            return
+        fi
+
+        printf '%s  Estimated savings: %s bytes (%s%%)\n\n' "$block" "$savings_bytes" "$savings_percent"
+    fi
+
+    COUNT=$((COUNT + 1))
+    BATCH_CURRENT_SIZE=$((BATCH_CURRENT_SIZE + filesize))
+    BATCH_EST_SIZE=$((BATCH_EST_SIZE + estimated_size))
+    TOTAL_CURRENT_SIZE=$((TOTAL_CURRENT_SIZE + filesize))
+    TOTAL_EST_SIZE=$((TOTAL_EST_SIZE + estimated_size))
+
+    if [ $((COUNT % BATCH_SIZE)) -eq 0 ]; then
+        echo -e "${CYAN}--- Batch of ${BATCH_SIZE} files ---${RESET}"
+        echo "  Batch current size:   $BATCH_CURRENT_SIZE bytes"
+        echo "  Batch estimated size: $BATCH_EST_SIZE bytes"
+        echo "  Batch savings:        $((BATCH_CURRENT_SIZE - BATCH_EST_SIZE)) bytes"
+        echo ""
+        if [ "$INTERACTIVE" -eq 1 ]; then
+            read -p "Press Enter to continue..."
+        fi
+        BATCH_CURRENT_SIZE=0
+        BATCH_EST_SIZE=0
+    fi
+}
+
+preview_mode() {
+    echo ""
+    echo -e "${MAGENTA}Preview Mode (reducible files only)${RESET}"
+    prompt_interactive_mode
+    prompt_savings_threshold
+    prompt_time_filter
+
+    COUNT=0
+    BATCH_CURRENT_SIZE=0
+    BATCH_EST_SIZE=0
+    TOTAL_CURRENT_SIZE=0
+    TOTAL_EST_SIZE=0
+
+    iterate_reducible_files preview_callback
+
+    if [ $((COUNT % BATCH_SIZE)) -ne 0 ] && [ "$COUNT" -ne 0 ]; then
+        echo -e "${CYAN}--- Final partial batch ($((COUNT % BATCH_SIZE)) files) ---${RESET}"
+        echo "  Batch current size:   $BATCH_CURRENT_SIZE bytes"
+        echo "  Batch estimated size: $BATCH_EST_SIZE bytes"
+        echo "  Batch savings:        $((BATCH_CURRENT_SIZE - BATCH_EST_SIZE)) bytes"
+        echo ""
+    fi
+
+    echo -e "${GREEN}=== Preview Totals (files meeting ${MIN_SAVINGS_PERCENT}%+ savings) ===${RESET}"
+    echo "Total files considered: $COUNT"
+    echo "Total current size:     $TOTAL_CURRENT_SIZE bytes"
+    echo "Total estimated size:   $TOTAL_EST_SIZE bytes"
+    echo "Total savings:          $((TOTAL_CURRENT_SIZE - TOTAL_EST_SIZE)) bytes"
+    if [ "$TOTAL_CURRENT_SIZE" -gt 0 ]; then
+        final_pct=$(( TOTAL_EST_SIZE * 100 / TOTAL_CURRENT_SIZE ))
+        echo "Estimated final size:   ${final_pct}% of original"
+    fi
+    echo ""
+}
+
+# -------- Progress Display --------
+show_reduce_progress() {
+    # Driven by worker events, so the line only changes when work does
+    local done_count="$1"
+    local active="$2"
+    local pct=0
+    if [ "$TOTAL" -gt 0 ]; then
+        pct=$(( done_count * 100 / TOTAL ))
+    fi
+
+    printf "\rProcessed %d / %d (%d%%) | Active workers: %d " \
+        "$done_count" "$TOTAL" "$pct" "$active"
+}
+
+# -------- CPU Pinning --------
+allowed_cpu_list() {
+    # Prints the CPU ids this shell may run on (space-separated), expanded
+    # from /proc's Cpus_allowed_list (e.g. "0-3,6"). Empty if unavailable.
+    local key value ranges="" range
+    [ -r /proc/self/status ] || return 0
+    while read -r key value; do
+        if [ "$key" = "Cpus_allowed_list:" ]; then
+            ranges="$value"
+        fi
+    done < /proc/self/status
+
+    local cpus=()
+    IFS=',' read -ra ranges <<< "$ranges"
+    for range in "${ranges[@]}"; do
+        if [[ "$range" == *-* ]]; then
+            cpus+=($(seq "${range%-*}" "${range#*-}"))
+        else
+            cpus+=("$range")
+        fi
+    done
+    echo "${cpus[*]}"
+}
+
+drop_page_cache() {
+    # GNU dd with iflag=nocache and count=0 only calls
+    # posix_fadvise(POSIX_FADV_DONTNEED) on the file; nothing is read or written
+    local f
+    for f in "$@"; do
+        dd if="$f" iflag=nocache count=0 status=none 2>/dev/null
+    done
+}
+
+# -------- Reduction Worker --------
+# Reduced outputs sit next to the original: "<dir>/<name>.mp3" becomes
+# "<dir>/<name>_reduced.mp3". Built with ${file%.mp3} so no dirname or
+# basename process is spawned per file. ffmpeg writes to a ".part" sibling
+# that is only renamed into place once the encode succeeds, so an
+# interrupted run never leaves a truncated *_reduced.mp3 behind.
+reduce_worker() {
+    # Runs inside each xargs worker; one ffmpeg process encodes the whole
+    # chunk of WORKER_CHUNK files (one input and one output per file)
+    # Progress events on stdout: "start", one "done" per file, then "end"
+    local file
+    local inputs=()
+    local outputs=()
+    local parts=()
+    local n=0
+    local status=0
+
+    echo start
+
+    # Each xargs slot gets its own CPU and a single-threaded encoder, so
+    # PARALLEL_JOBS ffmpeg processes don't oversubscribe the cores
+    local pin=()
+    local cpus=($PIN_CPUS)
+    if [ "${#cpus[@]}" -gt 0 ] && [ -n "$WORKER_SLOT" ]; then
+        pin=(taskset -c "${cpus[WORKER_SLOT % ${#cpus[@]}]}")
+    fi
+
+    for file in "$@"; do
+        parts+=("${file%.mp3}_reduced.mp3.part")
+        inputs+=(-threads 1 -i "$file")
+        outputs+=(-map "${n}:a:0" -map "${n}:v:0?" -map_metadata "$n" -map_chapters "$n" \
+                  -threads 1 -b:a 128k -f mp3 "${file%.mp3}_reduced.mp3.part")
+        n=$((n + 1))
+    done
+
+    # Exit status 255 makes xargs stop handing out further chunks
+    trap 'rm -f -- "${parts[@]}"; exit 255' INT TERM
+
+    "${pin[@]}" "$FFMPEG" -nostdin -loglevel error -y "${inputs[@]}" "${outputs[@]}" || status=$?
+    if [ "$status" -eq 0 ]; then
+        for file in "$@"; do
+            mv -f "${file%.mp3}_reduced.mp3.part" "${file%.mp3}_reduced.mp3"
+        done
+    elif [ "$status" -ge 128 ]; then
+        # 255 (ffmpeg's own INT/TERM exit) or 128+N (killed by a signal):
+        # the run is being stopped, so don't retry the chunk file by file
+        rm -f -- "${parts[@]}"
+        exit 255
+    else
+        # A single unreadable input fails the whole chunk; redo it file by file
+        for file in "$@"; do
+            status=0
+            "${pin[@]}" "$FFMPEG" -nostdin -loglevel error -y -threads 1 -i "$file" \
+                -threads 1 -b:a 128k -f mp3 "${file%.mp3}_reduced.mp3.part" || status=$?
+            if [ "$status" -eq 0 ]; then
+                mv -f "${file%.mp3}_reduced.mp3.part" "${file%.mp3}_reduced.mp3"
+            else
+                rm -f "${file%.mp3}_reduced.mp3.part"
+                [ "$status" -ge 128 ] && exit 255
+            fi
+        done
+    fi
+
+    if [ "$DROP_PAGE_CACHE" -eq 1 ]; then
+        for file in "$@"; do
+            drop_page_cache "$file" "${file%.mp3}_reduced.mp3"
+        done
+    fi
+
+    for file in "$@"; do
+        echo done
+    done
+    echo end
+}
+
+# -------- Reduction Mode (null-safe, threshold-aware, WSL-friendly) --------
+remove_partial_outputs() {
+    # Encodes write to *_reduced.mp3.part and are renamed when complete, so
+    # a .part file is always unfinished. Only files on this run's list
+    # (REDUCIBLE_LIST) are touched; another run in the same tree keeps its own.
+    local duration file
+    while IFS=$'\t' read -r -d '' duration file; do
+        rm -f -- "${file%.mp3}_reduced.mp3.part"
+    done < "$REDUCIBLE_LIST"
+}
+
+stop_reduce_workers() {
+    # Workers run in their own process group (REDUCE_WORKERS_PID); stop the
+    # whole group and wait until every worker has cleaned up and exited
+    kill -INT -- -"$REDUCE_WORKERS_PID" 2>/dev/null
+    while kill -0 -- -"$REDUCE_WORKERS_PID" 2>/dev/null; do
+        sleep 0.1
+    done
+    { wait "$REDUCE_WORKERS_PID"; } 2>/dev/null
+}
+
+reduce_mode() {
+    echo ""
+    echo -e "${MAGENTA}Reduction Mode (128 kbps)${RESET}"
+    echo -e "${YELLOW}Warning:${RESET} This will create new *_reduced.mp3 files."
+    prompt_savings_threshold
+    prompt_time_filter
+    read -p "Proceed with reduction? [y/N]: " ans
+    case "$ans" in
+        y|Y) ;;
+        *) echo -e "${YELLOW}Reduction cancelled.${RESET}"; return ;;
+    esac
+
+    REDUCIBLE_LIST=$(mktemp)
+
+    build_find_args
+
+    TOTAL=0
+    TOTAL_CURRENT_SIZE=0
+    TOTAL_EST_SIZE=0
+
+    while IFS='|' read -r -d '' _ bitrate duration filesize mtime file; do
+        remember_probe "$bitrate" "$duration" "$filesize" "$mtime" "$file"
+
+        if [ -z "$bitrate" ] || [ "$bitrate" -le "$TARGET_BITRATE" ]; then
+            continue
+        fi
+
+        if [ -z "$duration" ]; then
+            continue
+        fi
+
+        estimate_reduced_size "$duration"
+        estimated_size="$ESTIMATED_SIZE"
+        savings_bytes=$((filesize - estimated_size))
+        if [ "$savings_bytes" -le 0 ]; then
+            continue
+        fi
+
+        if [ $((savings_bytes * 100)) -lt $((MIN_SAVINGS_PERCENT * filesize)) ]; then
+            continue
+        fi
+
+        TOTAL=$((TOTAL + 1))
+        TOTAL_CURRENT_SIZE=$((TOTAL_CURRENT_SIZE + filesize))
+        TOTAL_EST_SIZE=$((TOTAL_EST_SIZE + estimated_size))
+        printf '%s\t%s\0' "$duration" "$file" >&4
+    done < <(probe_candidates) 4>"$REDUCIBLE_LIST"
+
+    if [ "$TOTAL" -eq 0 ]; then
+        echo -e "${YELLOW}No files meet the ${MIN_SAVINGS_PERCENT}% savings threshold (with current time filter).${RESET}"
+        rm -f "$REDUCIBLE_LIST"
+        return
+    fi
+
+    echo -e "${CYAN}Reducing $TOTAL files (>= ${MIN_SAVINGS_PERCENT}% savings)...${RESET}"
+
+    # Left over from an aborted run on the same files
+    remove_partial_outputs
+
+    # Longest tracks are handed out first so no worker is left encoding a
+    # long file alone at the end (the list holds "duration<TAB>file" entries)
+    local done_count=0
+    local active=0
+    local event
+    show_reduce_progress 0 0
+
+    PIN_CPUS=""
+    if [ "$PIN_WORKERS" -eq 1 ] && command -v taskset >/dev/null 2>&1; then
+        PIN_CPUS=$(allowed_cpu_list)
+    fi
+    export PIN_CPUS DROP_PAGE_CACHE
+    export -f reduce_worker drop_page_cache
+
+    # The workers get their own process group (set -m) so Ctrl+C reaches
+    # only this shell; the trap then stops them all before sweeping .part
+    # files, instead of leaving them encoding after the script has exited
+    local events
+    events=$(mktemp -u) && mkfifo "$events" || { rm -f "$REDUCIBLE_LIST"; return; }
+    set -m
+    (
+        LC_ALL=C sort -z -t $'\t' -k1,1gr "$REDUCIBLE_LIST" \
+            | cut -z -f2- \
+            | xargs -0 -P "$PARALLEL_JOBS" -n "$WORKER_CHUNK" \
+                  --process-slot-var=WORKER_SLOT \
+                  bash -c 'reduce_worker "$@"' _
+    ) > "$events" &
+    REDUCE_WORKERS_PID=$!
+    set +m
+    trap 'echo ""; stop_reduce_workers; remove_partial_outputs; rm -f "$REDUCIBLE_LIST" "$events"; exit 130' INT TERM
+
+    while read -r event; do
+        case "$event" in
+            start) active=$((active + 1)) ;;
+            done)  done_count=$((done_count + 1)) ;;
+            end)   active=$((active - 1)) ;;
+            *)     continue ;;
+        esac
+        show_reduce_progress "$done_count" "$active"
+    done < "$events"
+    wait "$REDUCE_WORKERS_PID"
+    trap - INT TERM
+    echo ""
+
+    rm -f "$REDUCIBLE_LIST" "$events"
+
+    echo -e "${GREEN}Reduction complete.${RESET}"
+    echo "Files reduced:      $TOTAL"
+    echo "Current total size: $TOTAL_CURRENT_SIZE bytes"
+    echo "Estimated new size: $TOTAL_EST_SIZE bytes"
+    echo "Estimated savings:  $((TOTAL_CURRENT_SIZE - TOTAL_EST_SIZE)) bytes"
+    if [ "$TOTAL_CURRENT_SIZE" -gt 0 ]; then
+        final_pct=$(( TOTAL_EST_SIZE * 100 / TOTAL_CURRENT_SIZE ))
+        echo "Estimated final size: ${final_pct}% of original"
+    fi
+}
+
+# -------- CSV Mode --------
+csv_callback() {
+    # Rows go to fd 4, which csv_mode points at CSV_FILE for the whole scan
+    local file="$1"
+    local bitrate="$2"
+    local filesize="$3"
+    local duration="$4"
+    local estimated_size="$5"
+
+    local savings_bytes=$((filesize - estimated_size))
+    local savings_percent=0
+    local status="included"
+
+    if [ "$savings_bytes" -gt 0 ]; then
+        savings_percent=$((savings_bytes * 100 / filesize))
+    fi
+
+    if [ "$savings_bytes" -le 0 ]; then
+        status="grow_or_equal"
+    elif [ "$savings_percent" -lt "$MIN_SAVINGS_PERCENT" ]; then
+        status="below_threshold"
+    fi
+
+    # Skipped and included files share the one row format; only the
+    # status column differs
+    echo "\"$file\",$bitrate,$filesize,$duration,$estimated_size,$savings_bytes,$savings_percent,$status," >&4
+    if [ "$status" != "included" ]; then
+        return
+    fi
+
+    COUNT=$((COUNT + 1))
+    BATCH_CURRENT_SIZE=$((BATCH_CURRENT_SIZE + filesize))
+    BATCH_EST_SIZE=$((BATCH_EST_SIZE + estimated_size))
+    TOTAL_CURRENT_SIZE=$((TOTAL_CURRENT_SIZE + filesize))
+    TOTAL_EST_SIZE=$((TOTAL_EST_SIZE + estimated_size))
+
+    if [ $((COUNT % BATCH_SIZE)) -eq 0 ] && [ "$CSV_BATCH_TOTALS" -eq 1 ]; then
+        local batch_savings=$((BATCH_CURRENT_SIZE - BATCH_EST_SIZE))
+        echo "\"BATCH_TOTAL_${COUNT}\",$TARGET_BITRATE,$BATCH_CURRENT_SIZE,,$BATCH_EST_SIZE,$batch_savings,,batch_total," >&4
+        BATCH_CURRENT_SIZE=0
+        BATCH_EST_SIZE=0
+    fi
+}
+
+csv_mode() {
+    echo ""
+    echo -e "${MAGENTA}CSV Export (reducible files only)${RESET}"
+    prompt_interactive_mode
+    prompt_csv_totals_mode
+    prompt_savings_threshold
+    prompt_time_filter
+
+    CSV_FILE="reduction_report_$(date +%Y%m%d_%H%M%S).csv"
+    echo "file,bitrate,current_size,duration,estimated_new_size,savings_bytes,savings_percent,status,final_size_percent" > "$CSV_FILE"
+
+    COUNT=0
+    BATCH_CURRENT_SIZE=0
+    BATCH_EST_SIZE=0
+    TOTAL_CURRENT_SIZE=0
+    TOTAL_EST_SIZE=0
+
+    # The report is opened once for the whole scan; csv_callback writes to
+    # fd 4 (fd 3 carries the probe records inside iterate_reducible_files)
+    iterate_reducible_files csv_callback 4>>"$CSV_FILE"
+
+    if [ "$CSV_BATCH_TOTALS" -eq 1 ] && [ $((COUNT % BATCH_SIZE)) -ne 0 ] && [ "$COUNT" -ne 0 ]; then
+        local batch_savings=$((BATCH_CURRENT_SIZE - BATCH_EST_SIZE))
+        echo "\"BATCH_TOTAL_${COUNT}\",$TARGET_BITRATE,$BATCH_CURRENT_SIZE,,$BATCH_EST_SIZE,$batch_savings,,batch_total," >> "$CSV_FILE"
+    fi
+
+    local grand_savings=$((TOTAL_CURRENT_SIZE - TOTAL_EST_SIZE))
+    local final_pct=""
+    if [ "$TOTAL_CURRENT_SIZE" -gt 0 ]; then
+        final_pct=$(( TOTAL_EST_SIZE * 100 / TOTAL_CURRENT_SIZE ))
+    fi
+    echo "\"GRAND_TOTAL\",$TARGET_BITRATE,$TOTAL_CURRENT_SIZE,,$TOTAL_EST_SIZE,$grand_savings,,grand_total,$final_pct" >> "$CSV_FILE"
+
+    echo -e "${GREEN}CSV export complete:${RESET} $CSV_FILE"
+}
+
+# -------- Safe Delete Mode --------
+mtime_newer() {
+    # True when find timestamp $1 is later than $2 (both %T@, "secs.fraction").
+    # The fraction has a fixed width, so equal seconds compare as strings;
+    # the whole value doesn't fit in shell integer math.
+    local s1="${1%.*}" s2="${2%.*}"
+    if [ "$s1" -ne "$s2" ]; then
+        [ "$s1" -gt "$s2" ]
+        return
+    fi
+    [[ "${1#*.}" > "${2#*.}" ]]
+}
+
+safe_delete_mode() {
+    echo ""
+    echo -e "${MAGENTA}Safe Delete Mode${RESET}"
+    echo -e "${YELLOW}This will delete original MP3s that have verified *_reduced.mp3 counterparts.${RESET}"
+    prompt_time_filter
+
+    read -p "Scan and show summary first? [Y/n]: " ans
+    case "$ans" in
+        n|N) ;;
+        *) ;;
+    esac
+
+    local candidates=0
+    local total_reclaim=0
+    local verified=()
+
+    build_find_args
+
+    # Single walk: originals (time filter applied) and existing reduced
+    # files come back together with their size and mtime, so the pairing
+    # checks below compare these values instead of stat'ing every file again.
+    # One record per file: reduced_stat[path]="size mtime" and
+    # originals[i]="size mtime path" (the path goes last, it may hold spaces)
+    local -A reduced_stat=()
+    local originals=()
+    local kind size mtime
+    while IFS=$'\t' read -r -d '' kind size mtime file; do
+        if [ "$kind" = "r" ]; then
+            reduced_stat["$file"]="$size $mtime"
+        else
+            originals+=("$size $mtime $file")
+        fi
+    done < <(find "${FIND_ARGS[@]}" -printf 'o\t%s\t%T@\t%p\0' \
+                  -o -iname "*_reduced.mp3" -type f -printf 'r\t%s\t%T@\t%p\0')
+
+    # Verified originals are remembered for the delete step by index
+    local i rec reduced entry
+    for i in "${!originals[@]}"; do
+        rec="${originals[$i]}"
+        size="${rec%% *}"
+        mtime="${rec#* }"
+        mtime="${mtime%% *}"
+        file="${rec#* * }"
+        reduced="${file%.mp3}_reduced.mp3"
+
+        # Same tests as before: the reduced file exists, is non-empty and
+        # is newer than its original
+        entry="${reduced_stat[$reduced]}"
+        if [ -z "$entry" ]; then
+            continue
+        fi
+        if [ "${entry%% *}" -eq 0 ]; then
+            continue
+        fi
+        if ! mtime_newer "${entry#* }" "$mtime"; then
+            continue
+        fi
+
+        if [ "$VERIFY_REDUCED" -eq 1 ]; then
+            "$FFPROBE" -v error -show_entries format=duration \
+                -of default=noprint_wrappers=1:nokey=1 "$reduced" >/dev/null 2>/dev/null || continue
+        fi
+
+        total_reclaim=$((total_reclaim + size))
+        candidates=$((candidates + 1))
+        verified+=("$i")
+    done
+
+    if [ "$candidates" -eq 0 ]; then
+        echo -e "${YELLOW}No safe delete candidates found (with current time filter).${RESET}"
+        return
+    fi
+
+    echo -e "${CYAN}Safe delete candidates:${RESET}"
+    echo "  Files:          $candidates"
+    echo "  Space reclaim:  $total_reclaim bytes"
+    echo ""
+    read -p "Proceed with deletion? [y/N]: " confirm
+    case "$confirm" in
+        y|Y) ;;
+        *) echo -e "${YELLOW}Deletion cancelled.${RESET}"; return ;;
+    esac
+
+    local delete_log="delete_log_$(date +%Y%m%d_%H%M%S).txt"
+    echo "Delete log - $(date)" > "$delete_log"
+
+    # The log stays open on fd 3 for the whole loop
+    for i in "${verified[@]}"; do
+        file="${originals[$i]#* * }"
+
+        # Cheap re-check in case the reduced file vanished since the scan
+        if [ ! -s "${file%.mp3}_reduced.mp3" ]; then
+            continue
+        fi
+
+        echo -e "${GREEN}Deleting original:${RESET} $file"
+        echo "Deleted: $file" >&3
+        rm -f "$file"
+    done 3>>"$delete_log"
+
+    echo -e "${GREEN}Safe delete complete.${RESET}"
+    echo "Details logged in: $delete_log"
+}
+
+# -------- Main Menu --------
+load_probe_cache
+trap save_probe_cache EXIT
+
+while true; do
+    echo ""
+    echo -e "${MAGENTA}MP3 Reduction Tool v1.2.0${RESET}"
+    echo "---------------------------"
+    echo "1) Preview files that would be reduced"
+    echo "2) Reduce files to 128 kbps"
+    echo "3) Export CSV report (reducible files)"
+    echo "4) Safe-delete originals (with verified reduced files)"
+    echo "5) Exit"
+    echo ""
+    read -p "Choose an option [1-5]: " choice
+
+    case "$choice" in
+        1) preview_mode ;;
+        2) reduce_mode ;;
+        3) csv_mode ;;
+        4) safe_delete_mode ;;
+        5) echo "Goodbye."; exit 0 ;;
+        *) echo -e "${YELLOW}Invalid choice.${RESET}" ;;
+    esac
+done